@@ -7,12 +7,66 @@ tracking processed files by their content hashes and associated metadata.
 
 from __future__ import annotations
 
+import atexit
 import sqlite3
-from typing import Dict
+import threading
+from collections import deque
+from typing import Deque, Dict
 
 from ulid import ULID
 
 
+_ID_POOL_SIZE = 1024
+
+# Bumped whenever _create_fresh_schema changes shape; lets startup skip the
+# table_info inspection entirely on an up-to-date database.
+_SCHEMA_VERSION = 2
+
+
+_SELECT_HASH_SQL = "SELECT 1 FROM processed_files WHERE file_hash = ?"
+
+_SELECT_ALL_HASHES_SQL = "SELECT file_hash FROM processed_files"
+
+_RESERVE_SQL = """
+    INSERT INTO processed_files (
+        file_hash, id, filename, input_dir, output_dir, input_size
+    ) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(file_hash) DO NOTHING
+    RETURNING 1
+"""
+
+_UPDATE_STATS_SQL = """
+    UPDATE processed_files SET output_size = ?, duration = ?
+    WHERE file_hash = ?
+"""
+
+_DELETE_HASH_SQL = "DELETE FROM processed_files WHERE file_hash = ?"
+
+_SELECT_CACHED_HASH_SQL = """
+    SELECT file_hash FROM file_stat_cache
+    WHERE input_dir = ? AND filename = ? AND mtime_ns = ? AND size = ?
+"""
+
+_UPSERT_CACHED_HASH_SQL = """
+    INSERT OR REPLACE INTO file_stat_cache (
+        input_dir, filename, mtime_ns, size, file_hash
+    ) VALUES (?, ?, ?, ?, ?)
+"""
+
+_INSERT_SQL = """
+    INSERT OR IGNORE INTO processed_files (
+        id,
+        filename,
+        input_dir,
+        output_dir,
+        file_hash,
+        input_size,
+        output_size,
+        duration
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 class Database:
     """
     Manages the SQLite database for tracking processed files.
@@ -25,15 +79,77 @@ class Database:
 
     def __init__(self, db_path: str = "processed_files.db") -> None:
         self.db_path: str = db_path
+        self._lock = threading.Lock()
+        # Module-level SQL constants keep the statement text identical call
+        # to call, so the per-connection prepared-statement cache hits every
+        # time instead of re-parsing.
+        self._conn: sqlite3.Connection = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._id_pool: Deque[str] = deque()
+        atexit.register(self.close)
         self._init_db()
 
+    def _next_id(self) -> str:
+        """
+        Pops a pre-generated ULID, refilling the pool in bulk when empty.
+
+        Generating ULIDs in batches amortizes the per-ID clock read and RNG
+        call across many inserts. The IDs are only used as opaque primary
+        keys, so carrying the refill-time timestamp is harmless.
+
+        Returns
+        -------
+        str
+            A 26-character ULID string.
+        """
+        if not self._id_pool:
+            self._id_pool.extend(ULID().str for _ in range(_ID_POOL_SIZE))
+        return self._id_pool.popleft()
+
     def _init_db(self) -> None:
         """Initializes and migrates the database schema if needed."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            self._ensure_schema(conn)
+        self._apply_pragmas(self._conn)
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == _SCHEMA_VERSION:
+            return
+        self._ensure_schema(self._conn)
+        self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Closes the shared connection. Safe to call multiple times."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None  # type: ignore[assignment]
+
+    def _apply_pragmas(self, conn: sqlite3.Connection) -> None:
+        """
+        Applies performance-oriented PRAGMA settings to a connection.
+
+        WAL journal mode is persisted in the database file header, so
+        connections opened later by ``is_processed``/``mark_processed``
+        inherit it automatically. In-memory databases skip WAL since it
+        only applies to on-disk files.
+
+        Parameters
+        ----------
+        conn : sqlite3.Connection
+            The connection to configure.
+        """
+        if self.db_path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA busy_timeout=5000")
 
     def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        self._create_stat_cache(conn)
         columns = self._get_table_info(conn)
         if not columns:
             self._create_fresh_schema(conn)
@@ -44,36 +160,64 @@ class Database:
             return
 
         self._add_missing_columns(conn, columns)
-        self._create_indexes(conn)
+
+    @staticmethod
+    def _create_stat_cache(conn: sqlite3.Connection) -> None:
+        # Maps a file's identity (scan root, root-relative path, mtime,
+        # size) to its previously computed content hash so unchanged files
+        # can skip re-hashing on repeat scans. The relative path keeps
+        # same-named files in different subdirectories (recursive mode)
+        # from clobbering each other's rows.
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS file_stat_cache (
+                input_dir TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                file_hash TEXT NOT NULL,
+                PRIMARY KEY (input_dir, filename)
+            ) WITHOUT ROWID
+            """
+        )
 
     def _create_fresh_schema(self, conn: sqlite3.Connection) -> None:
+        # Keyed directly on file_hash and declared WITHOUT ROWID so the hot
+        # lookup is a single B-tree probe; a separate hash index would be
+        # redundant with the primary key.
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS processed_files (
-                id TEXT PRIMARY KEY,
+                file_hash TEXT PRIMARY KEY,
+                id TEXT NOT NULL,
                 filename TEXT NOT NULL,
                 input_dir TEXT NOT NULL,
                 output_dir TEXT NOT NULL,
-                file_hash TEXT NOT NULL UNIQUE,
                 input_size INTEGER,
                 output_size INTEGER,
                 duration REAL,
                 processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+            ) WITHOUT ROWID
             """
         )
-        self._create_indexes(conn)
-
-    @staticmethod
-    def _create_indexes(conn: sqlite3.Connection) -> None:
-        conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_hash ON processed_files(file_hash)"
-        )
 
     def _rebuild_table(self, conn: sqlite3.Connection) -> None:
         rows = conn.execute("SELECT * FROM processed_files").fetchall()
         snapshot = [dict(row) for row in rows]
 
+        # The connection runs in autocommit; make the drop/recreate/copy
+        # atomic and pay one fsync for the whole rebuild.
+        conn.execute("BEGIN")
+        try:
+            self._copy_into_fresh_schema(conn, snapshot)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _copy_into_fresh_schema(
+        self, conn: sqlite3.Connection, snapshot: list[Dict[str, object]]
+    ) -> None:
         conn.execute("DROP TABLE processed_files")
         self._create_fresh_schema(conn)
 
@@ -93,9 +237,9 @@ class Database:
             """
         )
 
-        for record in snapshot:
-            conn.execute(
-                insert_sql,
+        conn.executemany(
+            insert_sql,
+            [
                 (
                     ULID().str,
                     record.get("filename", ""),
@@ -106,8 +250,10 @@ class Database:
                     record.get("output_size"),
                     record.get("duration"),
                     record.get("processed_at"),
-                ),
-            )
+                )
+                for record in snapshot
+            ],
+        )
 
     def _add_missing_columns(
         self, conn: sqlite3.Connection, existing: Dict[str, Dict[str, object]]
@@ -132,7 +278,12 @@ class Database:
         if id_column is None:
             return True
         column_type = str(id_column.get("type", "")).upper()
-        return column_type != "TEXT"
+        if column_type != "TEXT":
+            return True
+        # Pre-WITHOUT-ROWID layouts keyed the table on id rather than
+        # file_hash; migrate them to the hash-keyed schema.
+        hash_column = columns.get("file_hash")
+        return hash_column is None or not hash_column.get("pk")
 
     @staticmethod
     def _get_table_info(
@@ -149,6 +300,22 @@ class Database:
             }
         return info
 
+    def begin(self) -> None:
+        """
+        Opens an explicit transaction on the shared connection.
+
+        Batching several ``mark_processed`` calls between ``begin`` and
+        ``commit`` amortizes the per-transaction fsync across the batch.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+
+    def commit(self) -> None:
+        """Commits the current explicit transaction, if any."""
+        with self._lock:
+            if self._conn.in_transaction:
+                self._conn.execute("COMMIT")
+
     def is_processed(self, file_hash: str) -> bool:
         """
         Checks if a file with the given hash has already been processed.
@@ -163,13 +330,169 @@ class Database:
         bool
             True if the file hash exists in the database, False otherwise.
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "SELECT 1 FROM processed_files WHERE file_hash = ?",
-                (file_hash,),
+        with self._lock:
+            cursor = self._conn.execute(_SELECT_HASH_SQL, (file_hash,))
+            return cursor.fetchone() is not None
+
+    def load_hash_set(self) -> frozenset[str]:
+        """
+        Loads all known file hashes in a single query.
+
+        Callers scanning many files should fetch this once per cycle and
+        test membership in memory instead of issuing one ``is_processed``
+        SELECT per file.
+
+        Returns
+        -------
+        frozenset[str]
+            Every ``file_hash`` currently recorded in the database.
+        """
+        with self._lock:
+            cursor = self._conn.execute(_SELECT_ALL_HASHES_SQL)
+            return frozenset(row[0] for row in cursor)
+
+    def try_reserve(
+        self,
+        file_hash: str,
+        filename: str,
+        input_dir: str,
+        output_dir: str,
+        input_size: int | None,
+    ) -> bool:
+        """
+        Claims a file hash for processing.
+
+        A single ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` replaces
+        the separate existence check and insert: if a row comes back, the
+        hash was just claimed; if not, it was already present. Callers
+        should follow up with ``update_stats`` on success or ``discard`` if
+        processing fails, so failed files are retried on the next scan.
+
+        Note that run_once calls this inside its batch transaction, so a
+        claim only dedupes against committed records and other claims in
+        the same batch — it is not visible to other processes until the
+        batch commits. The tool assumes a single instance per database
+        (the long batch transaction would block a concurrent writer).
+
+        Parameters
+        ----------
+        file_hash : str
+            The content hash to claim.
+        filename : str
+            The name of the file.
+        input_dir : str
+            Directory scanned for PDF files.
+        output_dir : str
+            Directory where OCR output will be stored.
+        input_size : int or None
+            Size of the input file in bytes, if available.
+
+        Returns
+        -------
+        bool
+            True if the hash was claimed by this call, False if it was
+            already recorded.
+        """
+        record_id = self._next_id()
+        with self._lock:
+            cursor = self._conn.execute(
+                _RESERVE_SQL,
+                (file_hash, record_id, filename, input_dir, output_dir,
+                 input_size),
             )
             return cursor.fetchone() is not None
 
+    def update_stats(
+        self, file_hash: str, output_size: int | None, duration: float | None
+    ) -> None:
+        """
+        Fills in post-processing stats for a previously reserved hash.
+
+        Parameters
+        ----------
+        file_hash : str
+            The content hash that was reserved.
+        output_size : int or None
+            Size of the OCR output file in bytes, if available.
+        duration : float or None
+            Time spent (in seconds) performing OCR.
+        """
+        with self._lock:
+            self._conn.execute(
+                _UPDATE_STATS_SQL, (output_size, duration, file_hash)
+            )
+
+    def discard(self, file_hash: str) -> None:
+        """
+        Releases a reservation so the file is retried on a later scan.
+
+        Parameters
+        ----------
+        file_hash : str
+            The content hash to remove.
+        """
+        with self._lock:
+            self._conn.execute(_DELETE_HASH_SQL, (file_hash,))
+
+    def get_cached_hash(
+        self, input_dir: str, filename: str, mtime_ns: int, size: int
+    ) -> str | None:
+        """
+        Looks up a previously computed hash for an unchanged file.
+
+        Parameters
+        ----------
+        input_dir : str
+            Root directory the scan started from.
+        filename : str
+            Path of the file relative to ``input_dir``.
+        mtime_ns : int
+            Modification time in nanoseconds at the time of hashing.
+        size : int
+            File size in bytes at the time of hashing.
+
+        Returns
+        -------
+        str or None
+            The cached content hash, or None if the file is unknown or has
+            changed since it was last hashed.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                _SELECT_CACHED_HASH_SQL, (input_dir, filename, mtime_ns, size)
+            ).fetchone()
+            return row[0] if row is not None else None
+
+    def put_cached_hash(
+        self,
+        input_dir: str,
+        filename: str,
+        mtime_ns: int,
+        size: int,
+        file_hash: str,
+    ) -> None:
+        """
+        Records the hash computed for a file at a given (mtime, size).
+
+        Parameters
+        ----------
+        input_dir : str
+            Root directory the scan started from.
+        filename : str
+            Path of the file relative to ``input_dir``.
+        mtime_ns : int
+            Modification time in nanoseconds.
+        size : int
+            File size in bytes.
+        file_hash : str
+            The content hash that was computed.
+        """
+        with self._lock:
+            self._conn.execute(
+                _UPSERT_CACHED_HASH_SQL,
+                (input_dir, filename, mtime_ns, size, file_hash),
+            )
+
     def mark_processed(
         self,
         filename: str,
@@ -200,21 +523,10 @@ class Database:
         duration : float or None
             Time spent (in seconds) performing OCR.
         """
-        record_id = ULID().str
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR IGNORE INTO processed_files (
-                    id,
-                    filename,
-                    input_dir,
-                    output_dir,
-                    file_hash,
-                    input_size,
-                    output_size,
-                    duration
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+        record_id = self._next_id()
+        with self._lock:
+            self._conn.execute(
+                _INSERT_SQL,
                 (
                     record_id,
                     filename,
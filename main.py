@@ -8,16 +8,30 @@ on new or modified files.
 
 import argparse
 import logging
+import os
+import queue
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Tuple
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover - optional dependency
+    FileSystemEventHandler = object  # type: ignore[assignment, misc]
+    Observer = None  # type: ignore[assignment, misc]
+
 from database import Database
 from processor import Processor
 from scanner import Scanner
 
 
+# Seconds to let a burst of filesystem events settle before rescanning.
+WATCH_DEBOUNCE_SECONDS = 0.5
+
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,27 +41,6 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def _get_file_size(path: Path) -> int | None:
-    """
-    Safely fetches the size of a file in bytes.
-
-    Parameters
-    ----------
-    path : Path
-        File whose size should be read.
-
-    Returns
-    -------
-    int or None
-        Size in bytes if available; otherwise ``None`` when the stat call fails.
-    """
-    try:
-        return path.stat().st_size
-    except OSError as exc:  # noqa: BLE001
-        logger.warning(f"Unable to read size for {path}: {exc}")
-        return None
-
-
 def run_once(
     args: argparse.Namespace, db: Database, scanner: Scanner, processor: Processor
 ) -> None:
@@ -65,39 +58,83 @@ def run_once(
     processor : Processor
         The processor instance.
     """
-    logger.info(f"Scanning {args.input_dir}...")
-    files_to_process: List[Tuple[Path, str]] = []
+    logger.info("Scanning %s...", args.input_dir)
+    files_to_process: List[Tuple[Path, str, int | None]] = []
 
     pdf_files: List[Path] = scanner.get_pdf_files()
     if not pdf_files:
         logger.info("No PDF files found.")
         return
 
+    # One query up front instead of one SELECT round trip per file.
+    known_hashes = db.load_hash_set()
+
+    # Reuse hashes for files whose (mtime, size) is unchanged since the
+    # last scan; only changed or unseen files need to be read and hashed.
+    input_dir_str = str(scanner.input_dir)
+    hashed: List[Tuple[Path, str, int | None]] = []
+    to_hash: List[Path] = []
     for pdf_path in pdf_files:
-        try:
-            file_hash: str = scanner.calculate_hash(
-                pdf_path, retries=args.retries, retry_delay=args.retry_delay
+        st = scanner.cached_stat(pdf_path)
+        # Key the cache on the root-relative path, not the basename, so
+        # same-named files in different subdirectories stay distinct.
+        cached_hash = (
+            db.get_cached_hash(
+                input_dir_str,
+                os.path.relpath(pdf_path, input_dir_str),
+                st.st_mtime_ns,
+                st.st_size,
+            )
+            if st is not None
+            else None
+        )
+        if cached_hash is not None and st is not None:
+            hashed.append((pdf_path, cached_hash, st.st_size))
+        else:
+            to_hash.append(pdf_path)
+
+    # Hash the whole batch concurrently; reads and the hash cores release
+    # the GIL, so several hash states stay in flight at once.
+    for pdf_path, outcome in scanner.hash_many(
+        to_hash, retries=args.retries, retry_delay=args.retry_delay
+    ):
+        if isinstance(outcome, OSError):
+            logger.error(
+                "Could not read %s after retries: %s. Skipping.",
+                pdf_path.name,
+                outcome,
             )
-        except OSError as e:
-            logger.error(f"Could not read {pdf_path.name} after retries: {e}. Skipping.")
             continue
+        hashed.append((pdf_path, outcome.digest, outcome.size))
+        st = scanner.cached_stat(pdf_path)
+        if st is not None:
+            db.put_cached_hash(
+                input_dir_str,
+                os.path.relpath(pdf_path, input_dir_str),
+                st.st_mtime_ns,
+                st.st_size,
+                outcome.digest,
+            )
 
+    for pdf_path, file_hash, input_size in hashed:
         output_path: Path = processor.get_output_path(pdf_path)
 
         # Check DB
-        if db.is_processed(file_hash):
-            logger.debug(f"Skipping {pdf_path.name}: Already in database.")
+        if file_hash in known_hashes:
+            logger.debug("Skipping %s: Already in database.", pdf_path.name)
             continue
 
-        # Check Output existence
-        if output_path.exists() and not args.overwrite:
+        # Check Output existence (lexists avoids pathlib overhead and does
+        # not follow symlinks)
+        if os.path.lexists(output_path) and not args.overwrite:
             logger.info(
-                f"Skipping {pdf_path.name}: Output file already exists "
-                "(use --overwrite to force)."
+                "Skipping %s: Output file already exists "
+                "(use --overwrite to force).",
+                pdf_path.name,
             )
             continue
 
-        files_to_process.append((pdf_path, file_hash))
+        files_to_process.append((pdf_path, file_hash, input_size))
 
     if not files_to_process:
         logger.info("No new files to process.")
@@ -112,24 +149,188 @@ def run_once(
         files_to_process = files_to_process[: args.limit]
 
     logger.info(
-        f"Found {total_found} new files. Processing {len(files_to_process)} "
-        f"(limit: {args.limit})."
-    )
-
-    for pdf_path, file_hash in files_to_process:
-        input_size = _get_file_size(pdf_path)
-        result = processor.process(pdf_path, dry_run=args.dry_run)
-
-        if result.success and not args.dry_run:
-            db.mark_processed(
-                filename=pdf_path.name,
-                input_dir=str(scanner.input_dir),
-                output_dir=str(processor.output_dir),
-                file_hash=file_hash,
-                input_size=input_size,
-                output_size=result.output_size,
-                duration=result.duration,
-            )
+        "Found %d new files. Processing %d (limit: %d).",
+        total_found,
+        len(files_to_process),
+        args.limit,
+    )
+
+    if args.dry_run:
+        for pdf_path, _, _ in files_to_process:
+            processor.process(pdf_path, dry_run=True)
+        return
+
+    # ocrmypdf already fans out over several cores per document (see
+    # --jobs), so keep the document-level pool small enough that the two
+    # levels of parallelism do not oversubscribe the machine.
+    per_doc_jobs = processor.jobs or 4
+    ocr_workers = min(
+        len(files_to_process),
+        max(1, (os.cpu_count() or 1) // per_doc_jobs),
+    )
+    if processor.jobs is None:
+        # Without an explicit --jobs, ocrmypdf grabs every core per
+        # document; cap it at the count the pool was sized for so the
+        # two levels compose instead of oversubscribing.
+        processor.jobs = per_doc_jobs
+
+    # Batch all inserts for this iteration into one transaction so N
+    # successful files cost a single fsync instead of one each.
+    db.begin()
+    reserved_hashes: set[str] = set()
+    resolved_hashes: set[str] = set()
+    try:
+        with ProcessPoolExecutor(max_workers=ocr_workers) as pool:
+            ocr_futures = {}
+            for pdf_path, file_hash, input_size in files_to_process:
+                # One round trip claims the hash and detects duplicates
+                # within the batch in the same probe.
+                if not db.try_reserve(
+                    file_hash,
+                    pdf_path.name,
+                    str(scanner.input_dir),
+                    str(processor.output_dir),
+                    input_size,
+                ):
+                    logger.debug(
+                        "Skipping %s: hash already claimed.", pdf_path.name
+                    )
+                    continue
+                reserved_hashes.add(file_hash)
+                future = pool.submit(processor.process, pdf_path)
+                ocr_futures[future] = (pdf_path, file_hash)
+            for future in as_completed(ocr_futures):
+                pdf_path, file_hash = ocr_futures[future]
+                result = future.result()
+                if result.success:
+                    db.update_stats(
+                        file_hash, result.output_size, result.duration
+                    )
+                else:
+                    # Release the claim so the file is retried next scan.
+                    db.discard(file_hash)
+                resolved_hashes.add(file_hash)
+    finally:
+        # The commit must only cover finished work. If the loop aborted
+        # early (worker crash, KeyboardInterrupt), drop the claims whose
+        # OCR never completed so those files are retried next cycle
+        # instead of being committed with NULL stats and no output.
+        for file_hash in reserved_hashes - resolved_hashes:
+            db.discard(file_hash)
+        db.commit()
+
+
+class _PdfEventHandler(FileSystemEventHandler):
+    """Queues the paths of PDF files touched by filesystem events."""
+
+    def __init__(self, events: "queue.Queue[str]") -> None:
+        super().__init__()
+        self._events = events
+
+    def _enqueue(self, path: str) -> None:
+        if path.lower().endswith(".pdf"):
+            self._events.put(path)
+
+    def on_closed(self, event: object) -> None:
+        if not event.is_directory:  # type: ignore[attr-defined]
+            self._enqueue(event.src_path)  # type: ignore[attr-defined]
+
+    def on_created(self, event: object) -> None:
+        # Platforms without close-write notifications (macOS, Windows)
+        # only deliver created/moved events.
+        if not event.is_directory:  # type: ignore[attr-defined]
+            self._enqueue(event.src_path)  # type: ignore[attr-defined]
+
+    def on_moved(self, event: object) -> None:
+        if not event.is_directory:  # type: ignore[attr-defined]
+            self._enqueue(event.dest_path)  # type: ignore[attr-defined]
+
+
+def poll_loop(
+    args: argparse.Namespace, db: Database, scanner: Scanner, processor: Processor
+) -> None:
+    """
+    Runs scan/process cycles at a fixed polling interval.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed command-line arguments.
+    db : Database
+        The database instance.
+    scanner : Scanner
+        The scanner instance.
+    processor : Processor
+        The processor instance.
+    """
+    logger.info("Starting daemon mode (interval: %ds)...", args.interval)
+    try:
+        while True:
+            run_once(args, db, scanner, processor)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        logger.info("Daemon stopped by user.")
+
+
+def watch_loop(
+    args: argparse.Namespace, db: Database, scanner: Scanner, processor: Processor
+) -> None:
+    """
+    Reacts to filesystem events instead of polling the input directory.
+
+    New PDFs trigger a scan cycle after a short debounce window, so idle
+    periods cost nothing. Falls back to polling when watchdog is not
+    installed (install the 'watch' extra) or the filesystem does not
+    deliver events.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed command-line arguments.
+    db : Database
+        The database instance.
+    scanner : Scanner
+        The scanner instance.
+    processor : Processor
+        The processor instance.
+    """
+    if Observer is None:
+        logger.warning(
+            "watchdog is not installed; falling back to interval polling."
+        )
+        poll_loop(args, db, scanner, processor)
+        return
+
+    events: "queue.Queue[str]" = queue.Queue()
+    observer = Observer()
+    observer.schedule(
+        _PdfEventHandler(events),
+        str(scanner.input_dir),
+        recursive=scanner.recursive,
+    )
+    observer.start()
+    logger.info("Watching %s for new PDF files...", scanner.input_dir)
+
+    # Pick up whatever is already sitting in the input directory.
+    run_once(args, db, scanner, processor)
+    try:
+        while True:
+            batch = [events.get()]
+            # Debounce: let a burst of events (e.g. a bulk copy) settle,
+            # then drain the queue and scan once for the whole batch.
+            time.sleep(WATCH_DEBOUNCE_SECONDS)
+            while True:
+                try:
+                    batch.append(events.get_nowait())
+                except queue.Empty:
+                    break
+            logger.info("Detected %d file event(s); scanning.", len(batch))
+            run_once(args, db, scanner, processor)
+    except KeyboardInterrupt:
+        logger.info("Watcher stopped by user.")
+    finally:
+        observer.stop()
+        observer.join()
 
 
 def main() -> None:
@@ -161,6 +362,12 @@ def main() -> None:
     parser.add_argument(
         "--daemon", action="store_true", help="Run in daemon mode (continuous polling)"
     )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch the input directory for new files instead of polling "
+        "(requires watchdog; falls back to polling)",
+    )
     parser.add_argument(
         "--interval",
         type=int,
@@ -173,6 +380,25 @@ def main() -> None:
         default=5,
         help="Maximum number of files to process in one iteration (default: 5)",
     )
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Also scan subdirectories of the input directory",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes ocrmypdf may use per document "
+        "(default: let ocrmypdf decide)",
+    )
+    parser.add_argument(
+        "--downsample-above",
+        type=int,
+        default=None,
+        help="Downsample page images larger than this many pixels before "
+        "OCR (speeds up very high-DPI scans; default: off)",
+    )
     parser.add_argument(
         "--retries",
         type=int,
@@ -183,24 +409,26 @@ def main() -> None:
         "--retry-delay",
         type=int,
         default=5,
-        help="Delay in seconds between retries (default: 5)",
+        help="Base delay in seconds between retries; doubles each attempt "
+        "up to a 60s cap (default: 5)",
     )
 
     args: argparse.Namespace = parser.parse_args()
 
     # Initialize components
     db = Database(args.db_path)
-    scanner = Scanner(args.input_dir)
-    processor = Processor(args.output_dir)
+    scanner = Scanner(args.input_dir, recursive=args.recursive)
+    processor = Processor(
+        args.output_dir,
+        input_dir=args.input_dir,
+        jobs=args.jobs,
+        downsample_above=args.downsample_above,
+    )
 
-    if args.daemon:
-        logger.info(f"Starting daemon mode (interval: {args.interval}s)...")
-        try:
-            while True:
-                run_once(args, db, scanner, processor)
-                time.sleep(args.interval)
-        except KeyboardInterrupt:
-            logger.info("Daemon stopped by user.")
+    if args.watch:
+        watch_loop(args, db, scanner, processor)
+    elif args.daemon:
+        poll_loop(args, db, scanner, processor)
     else:
         run_once(args, db, scanner, processor)
         logger.info("One-off run completed.")
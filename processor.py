@@ -7,7 +7,9 @@ using the ocrmypdf library.
 
 from __future__ import annotations
 
+import functools
 import logging
+import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
@@ -35,16 +37,53 @@ class Processor:
     ----------
     output_dir : str
         The directory where processed files will be saved.
+    input_dir : str or None, optional
+        The directory inputs are scanned from. When set, the input's path
+        relative to it is mirrored under ``output_dir``, so same-named
+        files in different subdirectories (recursive mode) get distinct
+        output paths instead of overwriting each other. None keeps the
+        flat layout.
+    jobs : int or None, optional
+        Number of worker processes ocrmypdf may use per document; Tesseract
+        is single-threaded per page, so pages OCR in parallel up to this
+        count. None lets ocrmypdf pick (all cores).
+    downsample_above : int or None, optional
+        When set, ask ocrmypdf to downsample page images whose longest
+        dimension exceeds this many pixels before handing them to
+        Tesseract. Tesseract's runtime is roughly linear in pixel count,
+        so capping very high-DPI scans cuts OCR time with little accuracy
+        loss. None (the default) leaves images untouched.
     """
 
-    def __init__(self, output_dir: str) -> None:
+    def __init__(
+        self,
+        output_dir: str,
+        input_dir: str | None = None,
+        jobs: int | None = None,
+        downsample_above: int | None = None,
+    ) -> None:
         self.output_dir: Path = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-
+        self.input_dir: Path | None = (
+            Path(input_dir) if input_dir is not None else None
+        )
+        self.jobs: int | None = jobs
+        self.downsample_above: int | None = downsample_above
+        # Precomputed so get_output_path can join plain strings instead of
+        # re-parsing Path parts per call.
+        self._output_dir_str: str = str(self.output_dir)
+
+    @functools.lru_cache(maxsize=4096)
     def get_output_path(self, input_path: Path) -> Path:
         """
         Constructs the output path with 'ocr_' prefix.
 
+        When ``input_dir`` is known, the input's subdirectory structure is
+        mirrored under the output directory, so recursive scans with
+        duplicate basenames cannot collide on one output file. Results are
+        memoized since the daemon loop asks for the same paths every
+        polling cycle.
+
         Parameters
         ----------
         input_path : Path
@@ -55,7 +94,17 @@ class Processor:
         Path
             The corresponding output path.
         """
-        return self.output_dir / f"ocr_{input_path.name}"
+        subdir = self._output_dir_str
+        if self.input_dir is not None:
+            try:
+                relative_parent = input_path.relative_to(
+                    self.input_dir
+                ).parent
+            except ValueError:
+                relative_parent = None
+            if relative_parent is not None and relative_parent.parts:
+                subdir = os.path.join(subdir, *relative_parent.parts)
+        return Path(os.path.join(subdir, "ocr_" + input_path.name))
 
     def process(self, input_path: Path, dry_run: bool = False) -> ProcessResult:
         """
@@ -77,28 +126,37 @@ class Processor:
         output_path: Path = self.get_output_path(input_path)
 
         if dry_run:
-            logger.info(f"[DRY-RUN] Would process {input_path} -> {output_path}")
+            logger.info("[DRY-RUN] Would process %s -> %s", input_path, output_path)
             return ProcessResult(success=True, duration=0.0, output_size=None)
 
         start_time = time.perf_counter()
         try:
-            logger.info(f"Processing {input_path}...")
-            ocrmypdf.ocr(
-                input_path,
-                output_path,
-                deskew=True,
-                rotate_pages=True,
-                force_ocr=True,
-                progress_bar=False,
-            )
+            logger.info("Processing %s...", input_path)
+            # Mirrored subdirectories may not exist yet on the output side.
+            if output_path.parent != self.output_dir:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+            ocr_kwargs = {
+                "deskew": True,
+                "rotate_pages": True,
+                "force_ocr": True,
+                "progress_bar": False,
+            }
+            if self.jobs is not None:
+                ocr_kwargs["jobs"] = self.jobs
+            if self.downsample_above is not None:
+                ocr_kwargs["tesseract_downsample_large_images"] = True
+                ocr_kwargs["tesseract_downsample_above"] = (
+                    self.downsample_above
+                )
+            ocrmypdf.ocr(input_path, output_path, **ocr_kwargs)
             duration = time.perf_counter() - start_time
             try:
                 output_size = output_path.stat().st_size
             except OSError:
                 output_size = None
-            logger.info(f"Successfully processed {input_path} in {duration:.2f}s")
+            logger.info("Successfully processed %s in %.2fs", input_path, duration)
             return ProcessResult(True, duration, output_size)
         except Exception as exc:  # noqa: BLE001
             duration = time.perf_counter() - start_time
-            logger.error(f"Error processing {input_path}: {exc}")
+            logger.error("Error processing %s: %s", input_path, exc)
             return ProcessResult(False, duration, None)